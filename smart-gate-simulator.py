@@ -1,9 +1,236 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import argparse
+import bisect
+import ctypes
+import multiprocessing as mp
+import queue
 import time
 import json
 import os
 
+DEFAULT_VIP_MEMBERS = ('B1234XX', 'B5678YY', 'D9999ZZ')
+DEFAULT_SUBSCRIBERS = ('B2222AA', 'B3333BB', 'B4444CC')
+
+# Flow sequences based on member type and conditions
+FLOW_DEFINITIONS = {
+    'vip_flow': [
+        ('Idle', 'vehicle_arrive'),
+        ('Detected', 'plate_recognized'),
+        ('AuthCheck', 'vip_verified'),
+        ('OpenGate', 'gate_opens'),
+        ('Closed', 'vehicle_passes'),
+        ('Idle', 'flow_complete')
+    ],
+    'subscriber_flow': [
+        ('Idle', 'vehicle_arrive'),
+        ('Detected', 'plate_recognized'),
+        ('AuthCheck', 'subscriber_verified'),
+        ('OpenGate', 'gate_opens'),
+        ('Closed', 'vehicle_passes'),
+        ('Idle', 'flow_complete')
+    ],
+    'visitor_known_flow': [
+        ('Idle', 'vehicle_arrive'),
+        ('Detected', 'plate_recognized'),
+        ('AuthCheck', 'payment_required'),
+        ('WaitPayment', 'payment_processing'),
+        ('Confirmation', 'payment_confirmed'),
+        ('OpenGate', 'gate_opens'),
+        ('Closed', 'vehicle_passes'),
+        ('Idle', 'flow_complete')
+    ],
+    'visitor_unknown_flow': [
+        ('Idle', 'vehicle_arrive'),
+        ('Detected', 'plate_unknown'),
+        ('WaitPayment', 'payment_processing'),
+        ('Confirmation', 'payment_confirmed'),
+        ('OpenGate', 'gate_opens'),
+        ('Closed', 'vehicle_passes'),
+        ('Idle', 'flow_complete')
+    ],
+    'reject_capacity_flow': [
+        ('Idle', 'vehicle_arrive'),
+        ('Detected', 'plate_recognized'),
+        ('AuthCheck', 'capacity_full'),
+        ('Reject', 'access_denied'),
+        ('Idle', 'reset_complete')
+    ],
+    'reject_passback_flow': [
+        ('Idle', 'vehicle_arrive'),
+        ('Detected', 'anti_passback_detected'),
+        ('Reject', 'access_denied'),
+        ('Idle', 'reset_complete')
+    ]
+}
+
+
+def select_flow(plate, member_type, current_capacity, max_capacity):
+    """Pick the flow sequence for a vehicle given the lot occupancy"""
+    # Check capacity first
+    if current_capacity >= max_capacity:
+        return "reject_capacity_flow"
+    
+    # Check anti-passback (simple simulation - if same plate within 30 seconds)
+    # This is simplified for demo purposes
+    
+    if member_type == "vip":
+        return "vip_flow"
+    elif member_type == "subscriber":
+        return "subscriber_flow"
+    else:
+        # Check if plate is known (has been seen before)
+        if len(plate) > 0 and plate[0] in 'BD':  # Simple heuristic for known plates
+            return "visitor_known_flow"
+        else:
+            return "visitor_unknown_flow"
+
+
+def read_members(members_file):
+    """Read VIP and subscriber plates from JSON file, falling back to sample data"""
+    try:
+        with open(members_file, 'r') as f:
+            data = json.load(f)
+        return set(data.get('vip', [])), set(data.get('subscribers', []))
+    except Exception:
+        return set(DEFAULT_VIP_MEMBERS), set(DEFAULT_SUBSCRIBERS)
+
+
+class MemberIndex:
+    """Sorted set of plates that is updated incrementally with bisect"""
+    def __init__(self, plates=()):
+        self.members = set(plates)
+        self.plates = sorted(self.members)
+        
+    def __contains__(self, plate):
+        return plate in self.members
+    
+    def __len__(self):
+        return len(self.plates)
+    
+    def __iter__(self):
+        return iter(self.plates)
+    
+    def __getitem__(self, position):
+        return self.plates[position]
+    
+    def add(self, plate):
+        if plate not in self.members:
+            self.members.add(plate)
+            bisect.insort(self.plates, plate)
+            
+    def discard(self, plate):
+        if plate in self.members:
+            self.members.discard(plate)
+            del self.plates[bisect.bisect_left(self.plates, plate)]
+            
+    def remove(self, plate):
+        if plate not in self.members:
+            raise KeyError(plate)
+        self.discard(plate)
+        
+    def prefix_range(self, prefix):
+        """Return the (start, stop) positions of plates starting with prefix"""
+        start = bisect.bisect_left(self.plates, prefix)
+        stop = bisect.bisect_left(self.plates, prefix + '\U0010ffff')
+        return start, stop
+
+
+class SharedMemberIndex:
+    """Read-only sorted member index kept in shared memory.
+    
+    Each record is a plate NUL-padded to the longest plate in the index,
+    followed by a one-byte tier code. Worker processes binary-search the
+    buffer directly, so the member base is built once and never pickled
+    per site.
+    """
+    TIER_CODES = {b'V': "vip", b'S': "subscriber"}
+    
+    def __init__(self, buffer, count, plate_width):
+        self.buffer = buffer
+        self.count = count
+        self.plate_width = plate_width
+        self.record_size = plate_width + 1
+        
+    @classmethod
+    def build(cls, vip_members, subscribers):
+        tiers = {plate: b'S' for plate in subscribers}
+        tiers.update((plate, b'V') for plate in vip_members)
+        
+        keys = [(plate.encode('utf-8'), tier) for plate, tier in tiers.items()]
+        plate_width = max((len(key) for key, tier in keys), default=1)
+        records = sorted(key.ljust(plate_width, b'\0') + tier for key, tier in keys)
+        
+        buffer = mp.RawArray('c', max(len(records), 1) * (plate_width + 1))
+        data = b''.join(records)
+        ctypes.memmove(buffer, data, len(data))
+        return cls(buffer, len(records), plate_width)
+        
+    def lookup(self, plate):
+        """Return the member type for a plate: vip, subscriber or visitor"""
+        key = plate.encode('utf-8')
+        if len(key) > self.plate_width:
+            return "visitor"
+        key = key.ljust(self.plate_width, b'\0')
+        
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = mid * self.record_size
+            record = self.buffer[offset:offset + self.plate_width]
+            if record < key:
+                lo = mid + 1
+            elif record > key:
+                hi = mid
+            else:
+                tier = self.buffer[offset + self.plate_width:offset + self.record_size]
+                return self.TIER_CODES.get(tier, "visitor")
+        return "visitor"
+
+
+class FacilityEngine:
+    """Headless gate engine for one site in multi-facility mode"""
+    def __init__(self, site_id, member_index, occupancy, pending, capacities, events, step_delay=0.5):
+        self.site_id = site_id
+        self.member_index = member_index
+        self.occupancy = occupancy
+        self.pending = pending
+        self.capacities = capacities
+        self.events = events
+        self.step_delay = step_delay
+        
+    def log_event(self, message):
+        self.events.put((self.site_id, message))
+        
+    def process_vehicle(self, plate):
+        member_type = self.member_index.lookup(plate)
+        
+        # The site owns its occupancy counter: the vehicle leaves the pending
+        # queue and takes a bay in one step under the shared lock
+        with self.occupancy.get_lock():
+            self.pending[self.site_id] -= 1
+            current = self.occupancy[self.site_id]
+            flow_type = select_flow(plate, member_type, current, self.capacities[self.site_id])
+            if flow_type != "reject_capacity_flow":
+                self.occupancy[self.site_id] = current + 1
+                
+        self.log_event(f"🚀 Starting {flow_type} for {member_type.upper()}: {plate}")
+        for i, (state, event) in enumerate(FLOW_DEFINITIONS[flow_type]):
+            self.log_event(f"➡️ Step {i + 1}: {event.replace('_', ' ').title()} ({state})")
+            time.sleep(self.step_delay)
+        self.log_event(f"✅ Flow completed for {plate}")
+
+
+def run_facility_worker(site_id, member_index, occupancy, pending, capacities, arrivals, events, step_delay):
+    """Worker process entry point: serve arrivals for one site until told to stop"""
+    engine = FacilityEngine(site_id, member_index, occupancy, pending, capacities, events, step_delay)
+    while True:
+        plate = arrivals.get()
+        if plate is None:
+            break
+        engine.process_vehicle(plate)
+
+
 class SmartGateSimulator:
     def __init__(self):
         self.root = tk.Tk()
@@ -18,6 +245,7 @@ class SmartGateSimulator:
         
         # Member database
         self.members_file = "members.json"
+        self.save_after_id = None
         self.load_members()
         
         # Current session
@@ -36,19 +264,11 @@ class SmartGateSimulator:
         
     def load_members(self):
         """Load member database from JSON file"""
-        try:
-            if os.path.exists(self.members_file):
-                with open(self.members_file, 'r') as f:
-                    data = json.load(f)
-                    self.vip_members = set(data.get('vip', []))
-                    self.subscribers = set(data.get('subscribers', []))
-            else:
-                self.vip_members = {'B1234XX', 'B5678YY', 'D9999ZZ'}
-                self.subscribers = {'B2222AA', 'B3333BB', 'B4444CC'}
-                self.save_members()
-        except:
-            self.vip_members = {'B1234XX', 'B5678YY', 'D9999ZZ'}
-            self.subscribers = {'B2222AA', 'B3333BB', 'B4444CC'}
+        vip_members, subscribers = read_members(self.members_file)
+        self.vip_members = MemberIndex(vip_members)
+        self.subscribers = MemberIndex(subscribers)
+        if not os.path.exists(self.members_file):
+            self.save_members()
             
     def save_members(self):
         """Save member database to JSON file"""
@@ -57,63 +277,27 @@ class SmartGateSimulator:
                 'vip': list(self.vip_members),
                 'subscribers': list(self.subscribers)
             }
+            # json.dumps without indent uses the C encoder, which keeps large
+            # member bases quick to write
+            payload = json.dumps(data)
             with open(self.members_file, 'w') as f:
-                json.dump(data, f, indent=2)
+                f.write(payload)
         except Exception as e:
             print(f"Error saving members: {e}")
             
+    def schedule_save_members(self):
+        """Coalesce member edits into one save shortly after the last change"""
+        if self.save_after_id:
+            self.root.after_cancel(self.save_after_id)
+        self.save_after_id = self.root.after(1000, self.flush_members)
+        
+    def flush_members(self):
+        self.save_after_id = None
+        self.save_members()
+        
     def define_flows(self):
         """Define different flow sequences based on member type and conditions"""
-        self.flows = {
-            'vip_flow': [
-                ('Idle', 'vehicle_arrive'),
-                ('Detected', 'plate_recognized'),
-                ('AuthCheck', 'vip_verified'),
-                ('OpenGate', 'gate_opens'),
-                ('Closed', 'vehicle_passes'),
-                ('Idle', 'flow_complete')
-            ],
-            'subscriber_flow': [
-                ('Idle', 'vehicle_arrive'),
-                ('Detected', 'plate_recognized'),
-                ('AuthCheck', 'subscriber_verified'),
-                ('OpenGate', 'gate_opens'),
-                ('Closed', 'vehicle_passes'),
-                ('Idle', 'flow_complete')
-            ],
-            'visitor_known_flow': [
-                ('Idle', 'vehicle_arrive'),
-                ('Detected', 'plate_recognized'),
-                ('AuthCheck', 'payment_required'),
-                ('WaitPayment', 'payment_processing'),
-                ('Confirmation', 'payment_confirmed'),
-                ('OpenGate', 'gate_opens'),
-                ('Closed', 'vehicle_passes'),
-                ('Idle', 'flow_complete')
-            ],
-            'visitor_unknown_flow': [
-                ('Idle', 'vehicle_arrive'),
-                ('Detected', 'plate_unknown'),
-                ('WaitPayment', 'payment_processing'),
-                ('Confirmation', 'payment_confirmed'),
-                ('OpenGate', 'gate_opens'),
-                ('Closed', 'vehicle_passes'),
-                ('Idle', 'flow_complete')
-            ],
-            'reject_capacity_flow': [
-                ('Idle', 'vehicle_arrive'),
-                ('Detected', 'plate_recognized'),
-                ('AuthCheck', 'capacity_full'),
-                ('Reject', 'access_denied'),
-                ('Idle', 'reset_complete')
-            ],
-            'reject_passback_flow': [
-                ('Idle', 'vehicle_arrive'),
-                ('Detected', 'anti_passback_detected'),
-                ('Reject', 'access_denied'),
-                ('Idle', 'reset_complete')
-            ]
-        }
+        self.flows = FLOW_DEFINITIONS
         
     def setup_gui(self):
         # Main title
@@ -296,10 +480,34 @@ class SmartGateSimulator:
                                     bg="#2d2d2d", fg="#ffffff", font=("Arial", 12, "bold"))
         member_frame.pack(fill=tk.X, padx=10, pady=5)
         
-        # Member lists display
-        self.member_listbox = tk.Listbox(member_frame, height=6, bg="#1a1a1a", fg="#00ff88",
+        # Prefix search
+        search_frame = tk.Frame(member_frame, bg="#2d2d2d")
+        search_frame.pack(fill=tk.X, pady=2)
+        
+        tk.Label(search_frame, text="Search:", bg="#2d2d2d", fg="#ffffff").pack(side=tk.LEFT)
+        self.member_search_var = tk.StringVar()
+        self.member_search_var.trace_add("write", lambda *args: self.search_members())
+        tk.Entry(search_frame, textvariable=self.member_search_var,
+                font=("Arial", 10)).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        # Member lists display - virtualized, only the visible rows are inserted
+        self.member_rows = 6
+        self.member_offset = 0
+        self.selected_member = None
+        
+        list_frame = tk.Frame(member_frame, bg="#2d2d2d")
+        list_frame.pack(fill=tk.X, padx=5, pady=2)
+        
+        self.member_listbox = tk.Listbox(list_frame, height=self.member_rows, bg="#1a1a1a", fg="#00ff88",
                                         font=("Consolas", 9))
-        self.member_listbox.pack(fill=tk.X, padx=5, pady=2)
+        self.member_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.scroll_member_list)
+        self.member_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.member_listbox.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.member_listbox.bind('<<ListboxSelect>>', lambda e: self.select_member())
+        self.member_listbox.bind('<MouseWheel>', lambda e: self.scroll_member_list("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.member_listbox.bind('<Button-4>', lambda e: self.scroll_member_list("scroll", -1, "units"))
+        self.member_listbox.bind('<Button-5>', lambda e: self.scroll_member_list("scroll", 1, "units"))
         
         # Member management buttons
         btn_frame = tk.Frame(member_frame, bg="#2d2d2d")
@@ -332,9 +540,9 @@ class SmartGateSimulator:
         
     def set_quick_plate(self, plate_type):
         if plate_type == "vip":
-            plate = list(self.vip_members)[0] if self.vip_members else "B1234XX"
+            plate = self.vip_members[0] if self.vip_members else "B1234XX"
         elif plate_type == "sub":
-            plate = list(self.subscribers)[0] if self.subscribers else "B2222AA"
+            plate = self.subscribers[0] if self.subscribers else "B2222AA"
         elif plate_type == "new":
             plate = f"B{int(time.time()) % 10000:04d}XX"
         else:  # random
@@ -352,23 +560,7 @@ class SmartGateSimulator:
             return "visitor"
             
     def determine_flow_type(self, plate, member_type):
-        # Check capacity first
-        if self.current_capacity >= self.max_capacity:
-            return "reject_capacity_flow"
-        
-        # Check anti-passback (simple simulation - if same plate within 30 seconds)
-        # This is simplified for demo purposes
-        
-        if member_type == "vip":
-            return "vip_flow"
-        elif member_type == "subscriber":
-            return "subscriber_flow"
-        else:
-            # Check if plate is known (has been seen before)
-            if len(plate) > 0 and plate[0] in 'BD':  # Simple heuristic for known plates
-                return "visitor_known_flow"
-            else:
-                return "visitor_unknown_flow"
+        return select_flow(plate, member_type, self.current_capacity, self.max_capacity)
     
     def start_auto_flow(self):
         plate = self.plate_entry.get().strip().upper()
@@ -454,7 +646,9 @@ class SmartGateSimulator:
             self.vip_members.add(plate)
             if plate in self.subscribers:
                 self.subscribers.remove(plate)
-            self.save_members()
+            if self.selected_member and self.selected_member[1] == plate:
+                self.selected_member = ("vip", plate)
+            self.schedule_save_members()
             self.update_member_list()
             self.log_event(f"👑 Added VIP member: {plate}")
             
@@ -465,36 +659,101 @@ class SmartGateSimulator:
             self.subscribers.add(plate)
             if plate in self.vip_members:
                 self.vip_members.remove(plate)
-            self.save_members()
+            if self.selected_member and self.selected_member[1] == plate:
+                self.selected_member = ("subscriber", plate)
+            self.schedule_save_members()
             self.update_member_list()
             self.log_event(f"📋 Added subscriber: {plate}")
             
     def remove_member(self):
+        # Only remove what is selected in the rows currently shown
         selection = self.member_listbox.curselection()
-        if selection:
-            selected_text = self.member_listbox.get(selection[0])
-            if "VIP:" in selected_text:
-                plate = selected_text.split("VIP: ")[1]
-                self.vip_members.discard(plate)
-            elif "SUB:" in selected_text:
-                plate = selected_text.split("SUB: ")[1]
-                self.subscribers.discard(plate)
-            
-            self.save_members()
-            self.update_member_list()
+        if not selection:
+            return
+        vip_range, sub_range = self.member_view_ranges()
+        member = self.member_at_row(self.member_offset + selection[0], vip_range, sub_range)
+        if not member:
+            return
+        
+        member_type, plate = member
+        members = self.vip_members if member_type == "vip" else self.subscribers
+        self.selected_member = None
+        if plate in members:
+            members.remove(plate)
+            self.schedule_save_members()
             self.log_event(f"🗑️ Removed member: {plate}")
+        self.update_member_list()
             
-    def update_member_list(self):
-        self.member_listbox.delete(0, tk.END)
+    def member_view_ranges(self):
+        """Return the VIP and subscriber index ranges matching the search prefix"""
+        prefix = self.member_search_var.get().strip().upper()
+        return self.vip_members.prefix_range(prefix), self.subscribers.prefix_range(prefix)
+    
+    def member_at_row(self, row, vip_range, sub_range):
+        """Map a virtual list row to (member_type, plate), or None for header rows"""
+        vip_start, vip_stop = vip_range
+        sub_start, sub_stop = sub_range
+        vip_count = vip_stop - vip_start
+        
+        # Layout: VIP header, VIP rows, blank, SUB header, SUB rows
+        if 1 <= row <= vip_count:
+            return "vip", self.vip_members[vip_start + row - 1]
+        sub_row = row - vip_count - 3
+        if 0 <= sub_row < sub_stop - sub_start:
+            return "subscriber", self.subscribers[sub_start + sub_row]
+        return None
+        
+    def member_row_count(self, vip_range, sub_range):
+        return (vip_range[1] - vip_range[0]) + (sub_range[1] - sub_range[0]) + 3
+    
+    def search_members(self):
+        self.member_offset = 0
+        self.selected_member = None
+        self.update_member_list()
+        
+    def scroll_member_list(self, action, amount, unit=None):
+        vip_range, sub_range = self.member_view_ranges()
+        total = self.member_row_count(vip_range, sub_range)
         
-        self.member_listbox.insert(tk.END, "=== VIP MEMBERS ===")
-        for vip in sorted(self.vip_members):
-            self.member_listbox.insert(tk.END, f"VIP: {vip}")
+        if action == "moveto":
+            offset = int(float(amount) * total)
+        else:
+            step = self.member_rows if unit == "pages" else 1
+            offset = self.member_offset + int(amount) * step
             
-        self.member_listbox.insert(tk.END, "")
-        self.member_listbox.insert(tk.END, "=== SUBSCRIBERS ===")
-        for sub in sorted(self.subscribers):
-            self.member_listbox.insert(tk.END, f"SUB: {sub}")
+        self.member_offset = max(0, min(offset, total - self.member_rows))
+        self.update_member_list()
+        return "break"
+    
+    def select_member(self):
+        selection = self.member_listbox.curselection()
+        if selection:
+            vip_range, sub_range = self.member_view_ranges()
+            self.selected_member = self.member_at_row(self.member_offset + selection[0], vip_range, sub_range)
+            
+    def update_member_list(self):
+        vip_range, sub_range = self.member_view_ranges()
+        total = self.member_row_count(vip_range, sub_range)
+        self.member_offset = max(0, min(self.member_offset, total - self.member_rows))
+        vip_count = vip_range[1] - vip_range[0]
+        
+        self.member_listbox.delete(0, tk.END)
+        for row in range(self.member_offset, min(self.member_offset + self.member_rows, total)):
+            member = self.member_at_row(row, vip_range, sub_range)
+            if member:
+                member_type, plate = member
+                self.member_listbox.insert(tk.END, f"{'VIP' if member_type == 'vip' else 'SUB'}: {plate}")
+                if member == self.selected_member:
+                    self.member_listbox.selection_set(tk.END)
+            elif row == 0:
+                self.member_listbox.insert(tk.END, "=== VIP MEMBERS ===")
+            elif row == vip_count + 1:
+                self.member_listbox.insert(tk.END, "")
+            else:
+                self.member_listbox.insert(tk.END, "=== SUBSCRIBERS ===")
+                
+        self.member_scrollbar.set(self.member_offset / total,
+                                  min(self.member_offset + self.member_rows, total) / total)
             
     def reset_system(self):
         self.auto_flow_active = False
@@ -689,7 +948,203 @@ Total Members: {len(self.vip_members) + len(self.subscribers)}
         self.log_event(f"📊 System initialized with {len(self.vip_members)} VIP members and {len(self.subscribers)} subscribers")
         self.update_display()
         self.root.mainloop()
+        
+        # Write out any edit still waiting on its scheduled save
+        if self.save_after_id:
+            self.flush_members()
+
+class MultiFacilityCoordinator:
+    """Group view over several sites, each served by its own worker process"""
+    def __init__(self, site_count, max_capacity=50, members_file="members.json", step_delay=0.5):
+        self.site_names = [f"Site {i + 1}" for i in range(site_count)]
+        
+        # Shared state: member index and capacities are read-only, workers count
+        # occupied bays and the coordinator counts arrivals still queued per site.
+        # Both counters are guarded by the occupancy lock.
+        vip_members, subscribers = read_members(members_file)
+        self.member_index = SharedMemberIndex.build(vip_members, subscribers)
+        self.capacities = mp.RawArray('i', [max_capacity] * site_count)
+        self.occupancy = mp.Array('i', site_count)
+        self.pending = mp.RawArray('i', site_count)
+        self.events = mp.Queue()
+        self.arrivals = [mp.Queue() for _ in range(site_count)]
+        
+        # Start workers before Tk so no process inherits the GUI
+        self.workers = []
+        for site_id in range(site_count):
+            worker = mp.Process(target=run_facility_worker,
+                                args=(site_id, self.member_index, self.occupancy, self.pending,
+                                      self.capacities, self.arrivals[site_id], self.events, step_delay),
+                                daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        
+        self.root = tk.Tk()
+        self.root.title("Smart Gate System - Multi-Facility Coordinator")
+        self.root.geometry("1100x700")
+        self.root.configure(bg="#1a1a1a")
+        self.root.protocol("WM_DELETE_WINDOW", self.shutdown)
+        
+        self.setup_gui()
+        
+    def setup_gui(self):
+        tk.Label(self.root, text="🏢 SMART GATE SYSTEM - MULTI-FACILITY", 
+                font=("Arial", 24, "bold"), fg="#00ff88", bg="#1a1a1a").pack(pady=15)
+        
+        main_frame = tk.Frame(self.root, bg="#1a1a1a")
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20)
+        
+        # Left panel - group occupancy
+        site_frame = tk.Frame(main_frame, bg="#2d2d2d", relief=tk.RAISED, bd=2)
+        site_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
+        
+        self.group_label = tk.Label(site_frame, text="", 
+                                   font=("Arial", 16, "bold"), fg="#00ff88", bg="#2d2d2d")
+        self.group_label.pack(pady=10)
+        
+        self.site_listbox = tk.Listbox(site_frame, bg="#1a1a1a", fg="#00ff88",
+                                      font=("Consolas", 11))
+        self.site_listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        # Right panel - dispatch and log
+        control_frame = tk.Frame(main_frame, bg="#2d2d2d", relief=tk.RAISED, bd=2)
+        control_frame.pack(side=tk.RIGHT, fill=tk.BOTH, padx=(10, 0))
+        
+        dispatch_frame = tk.LabelFrame(control_frame, text="🚗 Dispatch Vehicle", 
+                                      bg="#2d2d2d", fg="#ffffff", font=("Arial", 12, "bold"))
+        dispatch_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        tk.Label(dispatch_frame, text="License Plate:", bg="#2d2d2d", fg="#ffffff").pack(anchor=tk.W)
+        self.plate_entry = tk.Entry(dispatch_frame, font=("Arial", 12), width=20)
+        self.plate_entry.pack(fill=tk.X, padx=5, pady=2)
+        self.plate_entry.bind('<Return>', lambda e: self.dispatch_vehicle())
+        
+        tk.Label(dispatch_frame, text="Arriving at:", bg="#2d2d2d", fg="#ffffff").pack(anchor=tk.W)
+        self.site_combo = ttk.Combobox(dispatch_frame, values=self.site_names, state="readonly")
+        self.site_combo.current(0)
+        self.site_combo.pack(fill=tk.X, padx=5, pady=2)
+        
+        tk.Button(dispatch_frame, text="▶️ DISPATCH", command=self.dispatch_vehicle,
+                 bg="#4CAF50", fg="white", font=("Arial", 10, "bold")).pack(fill=tk.X, pady=2)
+        tk.Button(dispatch_frame, text="EMPTY ALL SITES", command=self.empty_all_sites,
+                 bg="#607D8B", fg="white", font=("Arial", 8)).pack(fill=tk.X, pady=2)
+        
+        log_frame = tk.LabelFrame(control_frame, text="📋 Activity Log", 
+                                 bg="#2d2d2d", fg="#ffffff", font=("Arial", 10, "bold"))
+        log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        self.log_text = tk.Text(log_frame, width=60, bg="#1a1a1a", fg="#00ff88",
+                               font=("Consolas", 9))
+        scrollbar = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
+        
+        self.log_text.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.log_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+    def assign_site(self, preferred):
+        """Queue an arrival at the preferred site, or at the site with most free bays if it is full
+        
+        Arrivals still waiting in a site's queue count against its capacity,
+        so a burst of dispatches is redirected before the site's worker has
+        dequeued them.
+        """
+        with self.occupancy.get_lock():
+            free = [capacity - used - queued
+                    for capacity, used, queued in zip(self.capacities, self.occupancy[:], self.pending[:])]
+            target = preferred
+            if free[preferred] <= 0:
+                best = max(range(len(free)), key=lambda i: free[i])
+                # Nowhere to redirect to - let the site run its capacity rejection flow
+                if free[best] > 0:
+                    target = best
+            self.pending[target] += 1
+            return target
+        
+    def dispatch_vehicle(self):
+        plate = self.plate_entry.get().strip().upper()
+        if not plate:
+            messagebox.showwarning("Warning", "Please enter a license plate number!")
+            return
+        
+        preferred = self.site_combo.current()
+        target = self.assign_site(preferred)
+        if target != preferred:
+            self.log_event(f"↪️ {self.site_names[preferred]} full - redirecting {plate} to {self.site_names[target]}")
+        self.arrivals[target].put(plate)
+        self.plate_entry.delete(0, tk.END)
+        
+    def empty_all_sites(self):
+        with self.occupancy.get_lock():
+            for site_id in range(len(self.site_names)):
+                self.occupancy[site_id] = 0
+        self.log_event("🏢 All sites emptied")
+        
+    def log_event(self, message):
+        timestamp = time.strftime("%H:%M:%S")
+        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        self.log_text.see(tk.END)
+        
+    def poll(self):
+        # Drain worker events without blocking the GUI
+        while True:
+            try:
+                site_id, message = self.events.get_nowait()
+            except queue.Empty:
+                break
+            self.log_event(f"[{self.site_names[site_id]}] {message}")
+        
+        self.update_display()
+        self.root.after(500, self.poll)
+        
+    def update_display(self):
+        with self.occupancy.get_lock():
+            occupancy = self.occupancy[:]
+            pending = self.pending[:]
+        total_capacity = sum(self.capacities)
+        total_used = sum(occupancy)
+        
+        group_percent = (total_used / total_capacity) * 100
+        color = "#FF0000" if group_percent >= 100 else "#FF9800" if group_percent >= 80 else "#00ff88"
+        self.group_label.config(text=f"🏢 GROUP {total_used}/{total_capacity} ({group_percent:.0f}%)", fg=color)
+        
+        self.site_listbox.delete(0, tk.END)
+        for name, used, queued, capacity in zip(self.site_names, occupancy, pending, self.capacities):
+            status = "FULL" if used >= capacity else "AVAILABLE"
+            self.site_listbox.insert(tk.END, f"{name:<10} {used:>4}/{capacity:<4} {status:<9} +{queued} queued")
+            
+    def shutdown(self):
+        # Workers hold no state worth finishing, so stop them outright rather
+        # than waiting for queued arrivals to drain
+        for worker in self.workers:
+            worker.terminate()
+        for worker in self.workers:
+            worker.join(timeout=1)
+        for arrivals in self.arrivals:
+            arrivals.cancel_join_thread()
+        self.events.cancel_join_thread()
+        self.root.destroy()
+        
+    def run(self):
+        self.log_event(f"🚀 Multi-Facility Mode Started - {len(self.site_names)} sites")
+        self.log_event(f"📊 Shared member index loaded with {self.member_index.count} members")
+        self.poll()
+        self.root.mainloop()
 
 if __name__ == "__main__":
-    simulator = SmartGateSimulator()
-    simulator.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Smart Gate System - Auto Flow Simulator")
+    parser.add_argument("--sites", type=int, default=1,
+                        help="number of facilities; more than 1 starts multi-facility mode")
+    parser.add_argument("--capacity", type=int, default=50,
+                        help="max capacity per site in multi-facility mode")
+    args = parser.parse_args()
+    if args.sites < 1:
+        parser.error("--sites must be at least 1")
+    if args.capacity < 1:
+        parser.error("--capacity must be at least 1")
+    
+    if args.sites > 1:
+        coordinator = MultiFacilityCoordinator(args.sites, args.capacity)
+        coordinator.run()
+    else:
+        simulator = SmartGateSimulator()
+        simulator.run()
\ No newline at end of file
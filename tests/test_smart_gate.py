@@ -0,0 +1,271 @@
+import importlib.util
+import multiprocessing as mp
+import os
+import queue
+
+import pytest
+
+# The simulator lives in a hyphenated script, so load it by path
+MODULE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "smart-gate-simulator.py")
+spec = importlib.util.spec_from_file_location("smart_gate_simulator", MODULE_PATH)
+sg = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sg)
+
+
+def make_coordinator(capacities, occupancy=None):
+    coordinator = object.__new__(sg.MultiFacilityCoordinator)
+    coordinator.capacities = mp.RawArray('i', capacities)
+    coordinator.occupancy = mp.Array('i', occupancy or [0] * len(capacities))
+    coordinator.pending = mp.RawArray('i', len(capacities))
+    return coordinator
+
+
+def test_shared_index_lookup_tiers():
+    index = sg.SharedMemberIndex.build({'B1234XX', 'D9'}, {'B2222AA'})
+    assert index.lookup('B1234XX') == "vip"
+    assert index.lookup('D9') == "vip"
+    assert index.lookup('B2222AA') == "subscriber"
+    assert index.lookup('B9999ZZ') == "visitor"
+    assert index.lookup('') == "visitor"
+
+
+def test_shared_index_vip_wins_over_subscriber():
+    index = sg.SharedMemberIndex.build({'B1'}, {'B1', 'B2'})
+    assert index.count == 2
+    assert index.lookup('B1') == "vip"
+
+
+def test_shared_index_padding_does_not_match_prefixes():
+    # NUL padding must sort 'AB' before 'ABC' and keep them distinct
+    index = sg.SharedMemberIndex.build({'AB'}, {'ABC', 'A'})
+    assert index.lookup('AB') == "vip"
+    assert index.lookup('ABC') == "subscriber"
+    assert index.lookup('A') == "subscriber"
+    assert index.lookup('ABCD') == "visitor"
+
+
+def test_shared_index_sizes_records_to_longest_plate():
+    long_plate = 'Y' * 40
+    index = sg.SharedMemberIndex.build({'B1', long_plate}, {'B1234XX'})
+    assert index.count == 3
+    assert index.plate_width == 40
+    assert index.lookup(long_plate) == "vip"
+    assert index.lookup('B1234XX') == "subscriber"
+    assert index.lookup('Y' * 41) == "visitor"
+    assert index.lookup('Y' * 39) == "visitor"
+
+
+def test_shared_index_empty():
+    index = sg.SharedMemberIndex.build(set(), set())
+    assert index.count == 0
+    assert index.lookup('B1234XX') == "visitor"
+
+
+def test_assign_site_redirects_queued_overflow():
+    coordinator = make_coordinator([1, 5])
+    assert [coordinator.assign_site(0) for _ in range(3)] == [0, 1, 1]
+    assert coordinator.pending[:] == [1, 2]
+    assert coordinator.occupancy[:] == [0, 0]
+
+
+def test_assign_site_keeps_preferred_when_group_full():
+    coordinator = make_coordinator([1, 1], [1, 1])
+    assert coordinator.assign_site(1) == 1
+    assert coordinator.pending[:] == [0, 1]
+
+
+@pytest.mark.skipif("fork" not in mp.get_all_start_methods(), reason="requires fork")
+def test_worker_owns_site_occupancy():
+    ctx = mp.get_context("fork")
+    index = sg.SharedMemberIndex.build({'B1'}, set())
+    occupancy = ctx.Array('i', 1)
+    pending = ctx.RawArray('i', [2])
+    capacities = ctx.RawArray('i', [1])
+    arrivals, events = ctx.Queue(), ctx.Queue()
+    worker = ctx.Process(target=sg.run_facility_worker,
+                         args=(0, index, occupancy, pending, capacities, arrivals, events, 0.0))
+    worker.start()
+    arrivals.put('B1')
+    arrivals.put('B1')
+    arrivals.put(None)
+    worker.join(timeout=10)
+    assert occupancy[:] == [1]
+    assert pending[:] == [0]
+
+    messages = []
+    while True:
+        try:
+            messages.append(events.get(timeout=1)[1])
+        except queue.Empty:
+            break
+    starts = [message for message in messages if "Starting" in message]
+    assert starts == ["🚀 Starting vip_flow for VIP: B1",
+                      "🚀 Starting reject_capacity_flow for VIP: B1"]
+
+
+class StubListbox:
+    def __init__(self):
+        self.rows = []
+        self.selection = []
+
+    def delete(self, first, last):
+        self.rows = []
+        self.selection = []
+
+    def insert(self, index, text):
+        self.rows.append(text)
+
+    def selection_set(self, index):
+        self.selection.append(len(self.rows) - 1)
+
+    def curselection(self):
+        return tuple(self.selection)
+
+
+class StubScrollbar:
+    def set(self, first, last):
+        self.view = (first, last)
+
+
+class StubRoot:
+    def __init__(self):
+        self.scheduled = {}
+
+    def after(self, delay, callback):
+        after_id = f"after#{len(self.scheduled)}"
+        self.scheduled[after_id] = callback
+        return after_id
+
+    def after_cancel(self, after_id):
+        del self.scheduled[after_id]
+
+
+class StubVar:
+    def __init__(self, value=""):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def make_simulator(vip_members, subscribers, rows=6):
+    simulator = object.__new__(sg.SmartGateSimulator)
+    simulator.vip_members = sg.MemberIndex(vip_members)
+    simulator.subscribers = sg.MemberIndex(subscribers)
+    simulator.member_search_var = StubVar()
+    simulator.member_listbox = StubListbox()
+    simulator.member_scrollbar = StubScrollbar()
+    simulator.member_rows = rows
+    simulator.member_offset = 0
+    simulator.selected_member = None
+    simulator.root = StubRoot()
+    simulator.save_after_id = None
+    simulator.members_file = os.devnull
+    simulator.logged = []
+    simulator.log_event = simulator.logged.append
+    simulator.update_member_list()
+    return simulator
+
+
+def select_row(simulator, text):
+    simulator.member_listbox.selection = [simulator.member_listbox.rows.index(text)]
+    simulator.select_member()
+
+
+def test_member_index_keeps_sorted_order():
+    index = sg.MemberIndex(['B3', 'B1'])
+    index.add('B2')
+    index.add('B2')
+    index.add('A9')
+    assert list(index) == ['A9', 'B1', 'B2', 'B3']
+    assert len(index) == 4 and index[0] == 'A9'
+
+    index.discard('B2')
+    index.discard('ZZ')
+    assert list(index) == ['A9', 'B1', 'B3']
+    assert 'B2' not in index and 'B1' in index
+    with pytest.raises(KeyError):
+        index.remove('B2')
+
+
+def test_member_index_prefix_range():
+    index = sg.MemberIndex(['B1', 'B10', 'B2', 'BA', 'D1'])
+    start, stop = index.prefix_range('B1')
+    assert index[start:stop] == ['B1', 'B10']
+    start, stop = index.prefix_range('B')
+    assert index[start:stop] == ['B1', 'B10', 'B2', 'BA']
+    assert index.prefix_range('') == (0, 5)
+    start, stop = index.prefix_range('C')
+    assert start == stop
+
+
+def test_member_rows_layout_with_empty_vip_tier():
+    simulator = make_simulator([], ['B2', 'B3'])
+    assert simulator.member_listbox.rows == ["=== VIP MEMBERS ===", "", "=== SUBSCRIBERS ===",
+                                             "SUB: B2", "SUB: B3"]
+    vip_range, sub_range = simulator.member_view_ranges()
+    assert [simulator.member_at_row(row, vip_range, sub_range) for row in range(5)] == \
+        [None, None, None, ("subscriber", "B2"), ("subscriber", "B3")]
+
+
+def test_member_list_only_renders_visible_rows():
+    simulator = make_simulator([f"B{i:05d}" for i in range(1000)], ['D1'], rows=4)
+    assert len(simulator.member_listbox.rows) == 4
+    simulator.scroll_member_list("moveto", "1.0")
+    assert simulator.member_listbox.rows == ["VIP: B00999", "", "=== SUBSCRIBERS ===", "SUB: D1"]
+
+
+def test_search_clears_selection_so_hidden_member_is_not_removed():
+    simulator = make_simulator(['B1'], ['D1'])
+    select_row(simulator, "VIP: B1")
+    simulator.member_search_var.value = "D"
+    simulator.search_members()
+    simulator.remove_member()
+    assert 'B1' in simulator.vip_members
+    assert simulator.logged == []
+
+
+def test_scrolled_out_selection_is_not_removed():
+    simulator = make_simulator([f"B{i}" for i in range(10)], [], rows=3)
+    select_row(simulator, "VIP: B0")
+    simulator.scroll_member_list("scroll", "1", "pages")
+    simulator.remove_member()
+    assert 'B0' in simulator.vip_members
+
+
+def test_selection_follows_plate_across_tiers(monkeypatch):
+    simulator = make_simulator(['B1'], [])
+    select_row(simulator, "VIP: B1")
+    monkeypatch.setattr(sg.simpledialog, "askstring", lambda title, prompt: "b1")
+    simulator.add_subscriber()
+    assert simulator.selected_member == ("subscriber", "B1")
+
+    simulator.remove_member()
+    assert 'B1' not in simulator.subscribers and 'B1' not in simulator.vip_members
+    assert simulator.logged[-1] == "🗑️ Removed member: B1"
+
+
+def test_remove_selected_member():
+    simulator = make_simulator(['B1'], ['D1'])
+    select_row(simulator, "SUB: D1")
+    simulator.remove_member()
+    assert 'D1' not in simulator.subscribers
+    assert simulator.logged == ["🗑️ Removed member: D1"]
+    assert "SUB: D1" not in simulator.member_listbox.rows
+
+
+def test_member_edits_are_saved_once_after_last_change(tmp_path, monkeypatch):
+    simulator = make_simulator(['B1'], ['D1'])
+    simulator.members_file = str(tmp_path / "members.json")
+    plates = iter(["b2", "d2"])
+    monkeypatch.setattr(sg.simpledialog, "askstring", lambda title, prompt: next(plates))
+    simulator.add_vip_member()
+    simulator.add_subscriber()
+    assert not os.path.exists(simulator.members_file)
+    assert len(simulator.root.scheduled) == 1
+
+    callback, = simulator.root.scheduled.values()
+    callback()
+    assert simulator.save_after_id is None
+    assert sg.read_members(simulator.members_file) == ({'B1', 'B2'}, {'D1', 'D2'})